@@ -14,6 +14,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
 
+    # Hash de contraseñas (Argon2)
+    ARGON2_TIME_COST: int = Field(default=3)
+    ARGON2_MEMORY_COST: int = Field(default=65536)
+    ARGON2_PARALLELISM: int = Field(default=4)
+
     # API
     API_HOST: str = Field(default="localhost")
     API_PORT: int = Field(default=8000)
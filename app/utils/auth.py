@@ -11,7 +11,11 @@ from app.core.database import get_db
 from app.models.user import User
 
 # Configuración para hashear contraseñas con Argon2
-ph = PasswordHasher()
+ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
 
 # Configuración de seguridad
 security = HTTPBearer()
@@ -1,16 +1,28 @@
+import asyncio
+import functools
 import pytest
 import pytest_asyncio
-from httpx import AsyncClient
-from sqlalchemy import create_engine
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 import os
+import hashlib
 from datetime import datetime, timedelta, UTC
 
+try:
+    import uvloop
+except ImportError:  # uvicorn[standard] no instala uvloop en Windows
+    uvloop = None
+
 # Configurar variables de entorno para tests
-os.environ["DATABASE_URL"] = "sqlite:///./test_finance.db"
+os.environ["DATABASE_URL"] = "sqlite://"
 os.environ["SECRET_KEY"] = "test-secret-key-for-testing-only"
 os.environ["DEBUG"] = "True"
+# Costo mínimo de Argon2: los tests no validan la fortaleza del hash
+os.environ["ARGON2_TIME_COST"] = "1"
+os.environ["ARGON2_MEMORY_COST"] = "8"
+os.environ["ARGON2_PARALLELISM"] = "1"
 
 from app.core.database import Base, get_db
 from app.main import app
@@ -23,47 +35,128 @@ from app.models.debt import Debt
 from app.models.category import Category
 from app.models.budget import Budget, BudgetItem
 from decimal import Decimal
+from argon2.exceptions import VerifyMismatchError
 from app.utils.auth import get_password_hash, create_access_token
+import app.utils.auth as auth_utils
+import app.routers.auth as auth_router
 
-# Configurar base de datos de prueba
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_finance.db"
-
+# Configurar base de datos de prueba (en memoria; StaticPool mantiene una única conexión)
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
+    "sqlite://",
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+
+# pysqlite no emite BEGIN ni maneja SAVEPOINT correctamente por sí solo;
+# se delega el control de transacciones a SQLAlchemy
+@event.listens_for(engine, "connect")
+def _sqlite_connect(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _sqlite_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Crear tablas de prueba
+# Crear tablas de prueba (una sola vez por sesión)
 Base.metadata.create_all(bind=engine)
 
-def override_get_db():
-    """Sobrescribir la dependencia de base de datos para tests"""
+def _persist(obj):
+    """Guardar una fila fuera de la transacción de los tests (fixtures de clase o sesión).
+
+    El objeto queda desasociado de la sesión pero con sus atributos cargados.
+    """
+    db = TestingSessionLocal(expire_on_commit=False)
     try:
-        db = TestingSessionLocal()
-        yield db
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
     finally:
         db.close()
+    return obj
+
+def _remove(obj):
+    """Eliminar una fila creada con _persist"""
+    db = TestingSessionLocal()
+    try:
+        db.query(type(obj)).filter_by(id=obj.id).delete()
+        db.commit()
+    finally:
+        db.close()
+
+class _Sha256PasswordHasher:
+    """Sustituto de PasswordHasher para tests que no validan Argon2"""
+
+    def hash(self, password: str) -> str:
+        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+    def verify(self, hash: str, password: str) -> bool:
+        if self.hash(password) != hash:
+            raise VerifyMismatchError()
+        return True
+
+    def check_needs_rehash(self, hash: str) -> bool:
+        return False
 
-app.dependency_overrides[get_db] = override_get_db
+# Argon2 real de la app (con el costo mínimo configurado arriba)
+ARGON2_HASHER = auth_utils.ph
+
+def _set_password_hasher(mp, hasher):
+    """Reemplazar el PasswordHasher usado por las utilidades y el router de auth"""
+    mp.setattr(auth_utils, "ph", hasher)
+    mp.setattr(auth_router, "ph", hasher)
+
+@pytest.fixture(scope="session", autouse=True)
+def _stub_password_hasher():
+    """Evitar el costo de Argon2 en tests que prueban endpoints, no el hash"""
+    with pytest.MonkeyPatch.context() as mp:
+        _set_password_hasher(mp, _Sha256PasswordHasher())
+        yield
 
 @pytest.fixture
-def db_session():
-    """Fixture para sesión de base de datos"""
+def argon2_hasher(monkeypatch):
+    """Usar Argon2 real (costo mínimo) en tests que validan el hash"""
+    _set_password_hasher(monkeypatch, ARGON2_HASHER)
+
+@pytest.fixture(scope="session")
+def db_engine():
+    """Engine en memoria compartido por toda la sesión (esquema creado una sola vez)"""
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(autouse=True)
+def db_session(db_engine):
+    """Sesión de BD aislada por test.
+
+    Cada test corre dentro de una transacción externa que se revierte al
+    terminar; los commit() del test y de los endpoints solo liberan
+    SAVEPOINTs. Los endpoints reciben esta misma sesión vía get_db, así
+    que ven las filas creadas por el test sin necesidad de recrear tablas.
+
+    Como la sesión es única y get_current_user corre en el threadpool de
+    FastAPI, los requests de un test deben hacerse en secuencia (no con
+    asyncio.gather): una Session de SQLAlchemy no es segura entre hilos.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    app.dependency_overrides[get_db] = lambda: db
     try:
-        db = TestingSessionLocal()
         yield db
     finally:
+        app.dependency_overrides.pop(get_db, None)
         db.close()
+        transaction.rollback()
+        connection.close()
 
-@pytest.fixture
-def test_user(db_session):
-    """Crear usuario de prueba"""
+@pytest.fixture(scope="session")
+def test_user(db_engine):
+    """Crear usuario de prueba (una sola vez por sesión)"""
     import uuid
     unique_id = str(uuid.uuid4())[:8]
 
-    # Crear usuario mock directamente usando get_password_hash (Argon2)
+    # Crear usuario mock directamente usando get_password_hash
     pw = "testpassword123"
     user = User(
         email=f"test_{unique_id}@example.com",
@@ -72,84 +165,114 @@ def test_user(db_session):
         full_name=f"Test User {unique_id}",
         is_active=True
     )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    _persist(user)
+    yield user
+    _remove(user)
 
-@pytest.fixture
-def auth_headers(test_user):
-    """Crear headers de autenticación para tests"""
-    access_token = create_access_token(
-        data={"sub": test_user.username},
-        expires_delta=timedelta(minutes=30)
+@functools.lru_cache(maxsize=None)
+def _cached_token(username: str) -> str:
+    """Firmar un JWT por usuario y reutilizarlo durante toda la sesión"""
+    return create_access_token(
+        data={"sub": username},
+        expires_delta=timedelta(hours=2)
     )
-    return {"Authorization": f"Bearer {access_token}"}
 
-@pytest.fixture
-def test_category(db_session, test_user):
-    """Crear categoría de prueba"""
-    category = Category(
+@pytest.fixture(scope="session")
+def token_for():
+    """Obtener el token (memoizado) de un username"""
+    return _cached_token
+
+@pytest.fixture(scope="session")
+def auth_headers(test_user, token_for):
+    """Crear headers de autenticación (token firmado una sola vez por sesión)"""
+    return {"Authorization": f"Bearer {token_for(test_user.username)}"}
+
+@pytest.fixture(scope="session")
+def json_auth_headers(auth_headers):
+    """Headers de autenticación para requests con cuerpo JSON ya serializado"""
+    return {**auth_headers, "Content-Type": "application/json"}
+
+@pytest.fixture(scope="session")
+def valid_token():
+    """Token válido compartido por los tests de utilidades JWT"""
+    return create_access_token(data={"sub": "testuser"})
+
+@pytest.fixture(scope="session")
+def test_category(test_user):
+    """Crear categoría de prueba (una vez por sesión)"""
+    category = _persist(Category(
         user_id=test_user.id,
         name="Food",
         category_type="expense",
         description="Food and dining expenses"
-    )
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
+    ))
+    yield category
+    _remove(category)
 
-@pytest.fixture
-def test_expense(db_session, test_user, test_category):
-    """Crear gasto de prueba"""
-    expense = Expense(
+@pytest.fixture(scope="session")
+def expense_categories(test_user):
+    """Categorías de gasto extra del usuario de prueba, creadas una vez por sesión.
+
+    Se crean antes de abrir la transacción de cada test (la conexión en
+    memoria es única), así que no pueden generarse bajo demanda.
+    """
+    categories = {
+        name: _persist(Category(
+            user_id=test_user.id,
+            name=name,
+            category_type="expense",
+            description=f"{name} expenses"
+        ))
+        for name in ("Entertainment", "Services", "Test")
+    }
+    yield categories
+    for category in categories.values():
+        _remove(category)
+
+@pytest.fixture(scope="class")
+def test_expense(test_user, test_category):
+    """Crear gasto de prueba (una vez por clase; los cambios de cada test se revierten)"""
+    expense = _persist(Expense(
         user_id=test_user.id,
         category_id=test_category.id,
         amount=100.50,
         description="Test expense",
         date=datetime.now(UTC),
         payment_method_id=None
-    )
-    db_session.add(expense)
-    db_session.commit()
-    db_session.refresh(expense)
-    return expense
+    ))
+    yield expense
+    _remove(expense)
 
-@pytest.fixture
-def test_income_category(db_session, test_user):
-    """Crear categoría de ingreso de prueba"""
-    category = Category(
+@pytest.fixture(scope="class")
+def test_income_category(test_user):
+    """Crear categoría de ingreso de prueba (una vez por clase)"""
+    category = _persist(Category(
         user_id=test_user.id,
         name="Salary",
         category_type="income",
         description="Salary income"
-    )
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
+    ))
+    yield category
+    _remove(category)
 
-@pytest.fixture
-def test_income(db_session, test_user, test_income_category):
-    """Crear ingreso de prueba"""
-    income = Income(
+@pytest.fixture(scope="class")
+def test_income(test_user, test_income_category):
+    """Crear ingreso de prueba (una vez por clase; los cambios de cada test se revierten)"""
+    income = _persist(Income(
         user_id=test_user.id,
         category_id=test_income_category.id,
         amount=1000.00,
         description="Test income",
         source="Salary",
-        date=datetime.utcnow()
-    )
-    db_session.add(income)
-    db_session.commit()
-    db_session.refresh(income)
-    return income
+        date=datetime.now(UTC)
+    ))
+    yield income
+    _remove(income)
 
-@pytest.fixture
-def test_investment(db_session, test_user):
-    """Crear inversión de prueba"""
-    investment = Investment(
+@pytest.fixture(scope="class")
+def test_investment(test_user):
+    """Crear inversión de prueba (una vez por clase; los cambios de cada test se revierten)"""
+    investment = _persist(Investment(
         user_id=test_user.id,
         name="Test Stock",
         symbol="TEST",
@@ -162,16 +285,14 @@ def test_investment(db_session, test_user):
         current_price=110.00,
         broker_platform="Test Broker",
         is_active=True
-    )
-    db_session.add(investment)
-    db_session.commit()
-    db_session.refresh(investment)
-    return investment
+    ))
+    yield investment
+    _remove(investment)
 
-@pytest.fixture
-def test_financial_product(db_session, test_user):
-    """Crear producto financiero de prueba"""
-    product = FinancialProduct(
+@pytest.fixture(scope="session")
+def test_financial_product(test_user):
+    """Crear producto financiero de prueba (una vez por sesión; los cambios de cada test se revierten)"""
+    product = _persist(FinancialProduct(
         user_id=test_user.id,
         name="Test Savings Account",
         product_type="savings_account",
@@ -181,16 +302,14 @@ def test_financial_product(db_session, test_user):
         interest_rate=0.02,
         is_active=True,
         opening_date=datetime.now(UTC)
-    )
-    db_session.add(product)
-    db_session.commit()
-    db_session.refresh(product)
-    return product
+    ))
+    yield product
+    _remove(product)
 
-@pytest.fixture
-def test_debt(db_session, test_user):
-    """Crear deuda de prueba"""
-    debt = Debt(
+@pytest.fixture(scope="class")
+def test_debt(test_user):
+    """Crear deuda de prueba (una vez por clase; los cambios de cada test se revierten)"""
+    debt = _persist(Debt(
         user_id=test_user.id,
         name="Test Loan",
         debt_type="personal_loan",
@@ -201,11 +320,9 @@ def test_debt(db_session, test_user):
         minimum_payment=500.00,
         loan_start_date=datetime.now(UTC),
         is_paid_off=False
-    )
-    db_session.add(debt)
-    db_session.commit()
-    db_session.refresh(debt)
-    return debt
+    ))
+    yield debt
+    _remove(debt)
 
 @pytest.fixture
 def test_budget(db_session, test_user, test_category):
@@ -242,18 +359,25 @@ def test_budget_item(db_session, test_budget, test_category):
     db_session.refresh(budget_item)
     return budget_item
 
-@pytest_asyncio.fixture
+@pytest.fixture(scope="session")
+def event_loop():
+    """Event loop compartido por toda la sesión (requerido por fixtures async de sesión).
+
+    Usa uvloop cuando está disponible (lo instala uvicorn[standard] fuera de Windows).
+    """
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="session")
 async def async_client():
-    """Cliente HTTP async para tests"""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        yield ac
+    """Cliente HTTP async para tests (uno por sesión).
 
-@pytest.fixture(autouse=True)
-def clean_db():
-    """Limpiar base de datos después de cada test"""
-    yield
-    # Nota: En un ambiente real, podrías limpiar todas las tablas aquí
-    # Por simplicidad, usaremos una base de datos en memoria o recrearemos las tablas
+    La app no registra eventos de startup/shutdown ni lifespan, así que no
+    hace falta envolverla con LifespanManager.
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
 
 # Configuración para pytest-asyncio
 pytest_plugins = ("pytest_asyncio",)
\ No newline at end of file
@@ -1,4 +1,3 @@
-import pytest
 from httpx import AsyncClient
 from datetime import datetime
 from datetime import UTC
@@ -7,8 +6,7 @@ from sqlalchemy.orm import Session
 class TestFullFlows:
     """Tests de integración para flujos completos"""
 
-    @pytest.mark.asyncio
-    async def test_complete_user_registration_and_financial_setup(self, async_client: AsyncClient, db_session: Session):
+    async def test_complete_user_registration_and_financial_setup(self, async_client: AsyncClient, db_session: Session, token_for):
         """Test flujo completo: configuración financiera inicial"""
 
         # 1. Crear usuario mock directamente en BD (evitar bcrypt)
@@ -30,8 +28,7 @@ class TestFullFlows:
         db_session.refresh(mock_user)
 
         # Crear token mock
-        from app.utils.auth import create_access_token
-        token = create_access_token(data={"sub": mock_user.username})
+        token = token_for(mock_user.username)
         headers = {"Authorization": f"Bearer {token}"}
 
         # 2. Crear categorías primero
@@ -276,13 +273,11 @@ class TestFullFlows:
 
         print("✅ Test de flujo completo exitoso!")
 
-    @pytest.mark.asyncio
-    async def test_user_isolation(self, async_client: AsyncClient, db_session):
+    async def test_user_isolation(self, async_client: AsyncClient, db_session, token_for):
         """Test aislamiento de datos entre usuarios"""
 
         # Crear dos usuarios mock directamente en BD
         from app.models.user import User
-        from app.utils.auth import create_access_token
         import uuid
 
         unique_id1 = str(uuid.uuid4())[:8]
@@ -309,10 +304,10 @@ class TestFullFlows:
         db_session.commit()
 
         # Crear tokens mock
-        token1 = create_access_token(data={"sub": user1.username})
+        token1 = token_for(user1.username)
         headers1 = {"Authorization": f"Bearer {token1}"}
 
-        token2 = create_access_token(data={"sub": user2.username})
+        token2 = token_for(user2.username)
         headers2 = {"Authorization": f"Bearer {token2}"}
 
         # Crear categoría para usuario 1
@@ -353,13 +348,11 @@ class TestFullFlows:
 
         print("✅ Test de aislamiento de usuarios exitoso!")
 
-    @pytest.mark.asyncio
-    async def test_error_handling_and_validation(self, async_client: AsyncClient, db_session):
+    async def test_error_handling_and_validation(self, async_client: AsyncClient, db_session, token_for):
         """Test manejo de errores y validación"""
 
         # Crear usuario mock directamente en BD
         from app.models.user import User
-        from app.utils.auth import create_access_token
         import uuid
 
         unique_id = str(uuid.uuid4())[:8]
@@ -373,7 +366,7 @@ class TestFullFlows:
         db_session.add(error_user)
         db_session.commit()
 
-        token = create_access_token(data={"sub": error_user.username})
+        token = token_for(error_user.username)
         headers = {"Authorization": f"Bearer {token}"}
 
         # 1. Test validación de datos requeridos
@@ -397,7 +390,6 @@ class TestFullFlows:
         # 4. Test operaciones en recursos de otros usuarios
         # Crear otro usuario mock directamente en BD
         from app.models.user import User
-        from app.utils.auth import create_access_token
         import uuid
 
         other_unique_id = str(uuid.uuid4())[:8]
@@ -411,7 +403,7 @@ class TestFullFlows:
         db_session.add(other_user)
         db_session.commit()
 
-        other_token = create_access_token(data={"sub": other_user.username})
+        other_token = token_for(other_user.username)
         other_headers = {"Authorization": f"Bearer {other_token}"}
 
         # Crear categoría para el otro usuario
@@ -454,13 +446,11 @@ class TestFullFlows:
 
         print("✅ Test de manejo de errores exitoso!")
 
-    @pytest.mark.asyncio
-    async def test_data_consistency_across_endpoints(self, async_client: AsyncClient, db_session):
+    async def test_data_consistency_across_endpoints(self, async_client: AsyncClient, db_session, token_for):
         """Test consistencia de datos entre diferentes endpoints"""
 
         # Crear usuario mock directamente en BD
         from app.models.user import User
-        from app.utils.auth import create_access_token
         import uuid
 
         unique_id = str(uuid.uuid4())[:8]
@@ -474,7 +464,7 @@ class TestFullFlows:
         db_session.add(consistency_user)
         db_session.commit()
 
-        token = create_access_token(data={"sub": consistency_user.username})
+        token = token_for(consistency_user.username)
         headers = {"Authorization": f"Bearer {token}"}
 
         # Crear categoría
@@ -539,13 +529,11 @@ class TestFullFlows:
 
         print("✅ Test de consistencia de datos exitoso!")
 
-    @pytest.mark.asyncio
-    async def test_pagination_across_all_entities(self, async_client: AsyncClient, db_session):
+    async def test_pagination_across_all_entities(self, async_client: AsyncClient, db_session, token_for):
         """Test paginación en todas las entidades"""
 
         # Crear usuario mock directamente en BD
         from app.models.user import User
-        from app.utils.auth import create_access_token
         import uuid
 
         unique_id = str(uuid.uuid4())[:8]
@@ -559,7 +547,7 @@ class TestFullFlows:
         db_session.add(pagination_user)
         db_session.commit()
 
-        token = create_access_token(data={"sub": pagination_user.username})
+        token = token_for(pagination_user.username)
         headers = {"Authorization": f"Bearer {token}"}
 
         # Crear categoría para gastos
@@ -646,13 +634,11 @@ class TestFullFlows:
 
         print("✅ Test de paginación exitoso!")
 
-    @pytest.mark.asyncio
-    async def test_concurrent_operations(self, async_client: AsyncClient, db_session):
+    async def test_concurrent_operations(self, async_client: AsyncClient, db_session, token_for):
         """Test operaciones concurrentes"""
 
         # Crear usuario mock directamente en BD
         from app.models.user import User
-        from app.utils.auth import create_access_token
         import uuid
 
         unique_id = str(uuid.uuid4())[:8]
@@ -666,7 +652,7 @@ class TestFullFlows:
         db_session.add(concurrent_user)
         db_session.commit()
 
-        token = create_access_token(data={"sub": concurrent_user.username})
+        token = token_for(concurrent_user.username)
         headers = {"Authorization": f"Bearer {token}"}
 
         # Crear categoría para gastos concurrentes
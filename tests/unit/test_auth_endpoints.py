@@ -1,20 +1,19 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.utils.auth import verify_token
 
+INVALID_BEARER = {"Authorization": "Bearer invalid.token.here"}
+
 class TestAuthEndpoints:
     """Tests para endpoints de autenticación"""
 
-    @pytest.mark.asyncio
     async def test_register_user_success(self, async_client: AsyncClient, db_session: Session):
         """Test registro de usuario exitoso"""
-        import uuid
-        unique_id = str(uuid.uuid4())[:8]
-
         user_data = {
-            "email": f"newuser_{unique_id}@example.com",
-            "username": f"newuser_{unique_id}",
+            "email": "newuser@example.com",
+            "username": "newuser",
             "password": "securepass123",
             "full_name": "New User"
         }
@@ -25,23 +24,19 @@ class TestAuthEndpoints:
         data = response.json()
         assert "access_token" in data
         assert data["token_type"] == "bearer"
-        assert len(data["access_token"]) > 0
 
         # Verificar que el usuario se creó en la base de datos
         from app.models.user import User
-        user = db_session.query(User).filter(User.username == f"newuser_{unique_id}").first()
-        assert user is not None
-        assert user.email == f"newuser_{unique_id}@example.com"
-        assert user.full_name == "New User"
+        row = db_session.execute(
+            select(User.email, User.full_name).where(User.username == "newuser")
+        ).one()
+        assert row.email == "newuser@example.com"
+        assert row.full_name == "New User"
 
-    @pytest.mark.asyncio
     async def test_register_user_duplicate_username(self, async_client: AsyncClient, test_user, db_session: Session):
         """Test registro con username duplicado"""
-        import uuid
-        unique_id = str(uuid.uuid4())[:8]
-
         user_data = {
-            "email": f"different_{unique_id}@example.com",
+            "email": "different@example.com",
             "username": test_user.username,  # Username existente
             "password": "securepass123",
             "full_name": "Different User"
@@ -53,7 +48,6 @@ class TestAuthEndpoints:
         data = response.json()
         assert "El nombre de usuario ya está registrado" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_register_user_duplicate_email(self, async_client: AsyncClient, test_user, db_session: Session):
         """Test registro con email duplicado"""
         user_data = {
@@ -69,7 +63,6 @@ class TestAuthEndpoints:
         data = response.json()
         assert "El email ya está registrado" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_register_user_invalid_email(self, async_client: AsyncClient):
         """Test registro con email inválido"""
         user_data = {
@@ -82,7 +75,6 @@ class TestAuthEndpoints:
         response = await async_client.post("/auth/register", json=user_data)
         assert response.status_code == 422
 
-    @pytest.mark.asyncio
     async def test_register_user_short_password(self, async_client: AsyncClient):
         """Test registro con contraseña muy corta"""
         user_data = {
@@ -96,7 +88,6 @@ class TestAuthEndpoints:
         # Should return 422 Unprocessable Entity for validation error
         assert response.status_code == 422
 
-    @pytest.mark.asyncio
     async def test_login_success(self, async_client: AsyncClient, test_user):
         """Test login exitoso"""
         login_data = {
@@ -104,15 +95,13 @@ class TestAuthEndpoints:
             "password": "testpassword123"
         }
 
-        response = await async_client.post("/auth/login", data=login_data, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        response = await async_client.post("/auth/login", data=login_data)
 
         assert response.status_code == 200
         data = response.json()
         assert "access_token" in data
         assert data["token_type"] == "bearer"
-        assert len(data["access_token"]) > 0
 
-    @pytest.mark.asyncio
     async def test_login_wrong_username(self, async_client: AsyncClient):
         """Test login con username incorrecto"""
         login_data = {
@@ -120,13 +109,12 @@ class TestAuthEndpoints:
             "password": "testpassword123"
         }
 
-        response = await async_client.post("/auth/login", data=login_data, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        response = await async_client.post("/auth/login", data=login_data)
 
         assert response.status_code == 401
         data = response.json()
         assert "Usuario o contraseña incorrectos" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_login_wrong_password(self, async_client: AsyncClient, test_user):
         """Test login con contraseña incorrecta"""
         login_data = {
@@ -134,24 +122,20 @@ class TestAuthEndpoints:
             "password": "wrongpassword"
         }
 
-        response = await async_client.post("/auth/login", data=login_data, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        response = await async_client.post("/auth/login", data=login_data)
 
         assert response.status_code == 401
         data = response.json()
         assert "Usuario o contraseña incorrectos" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_login_inactive_user(self, async_client: AsyncClient, db_session):
         """Test login con usuario inactivo"""
         # Crear usuario inactivo directamente en BD (evitar bcrypt)
         from app.models.user import User
-        import uuid
-
-        unique_id = str(uuid.uuid4())[:8]
         from app.utils.auth import get_password_hash
         inactive_user = User(
-            email=f"inactive_{unique_id}@example.com",
-            username=f"inactiveuser_{unique_id}",
+            email="inactive@example.com",
+            username="inactiveuser",
             hashed_password=get_password_hash("endpoint_test_pw"),
             full_name="Inactive User",
             is_active=False
@@ -160,11 +144,11 @@ class TestAuthEndpoints:
         db_session.commit()
 
         login_data = {
-            "username": f"inactiveuser_{unique_id}",
+            "username": "inactiveuser",
             "password": "testpassword123"
         }
 
-        response = await async_client.post("/auth/login", data=login_data, headers={"Content-Type": "application/x-www-form-urlencoded"})
+        response = await async_client.post("/auth/login", data=login_data)
 
         # Current implementation returns 401 Unauthorized when credentials are invalid
         assert response.status_code in (400, 401)
@@ -172,7 +156,6 @@ class TestAuthEndpoints:
         # message may vary depending on implementation: check either phrase
         assert any(msg in data.get("detail", "") for msg in ["Usuario inactivo", "Usuario o contraseña incorrectos"]) 
 
-    @pytest.mark.asyncio
     async def test_get_current_user_info(self, async_client: AsyncClient, auth_headers, test_user):
         """Test obtener información del usuario actual"""
         response = await async_client.get("/auth/me", headers=auth_headers)
@@ -185,25 +168,20 @@ class TestAuthEndpoints:
         assert data["full_name"] == test_user.full_name
         assert data["is_active"] is True
 
-    @pytest.mark.asyncio
     async def test_get_current_user_info_invalid_token(self, async_client: AsyncClient):
         """Test obtener información con token inválido"""
-        invalid_headers = {"Authorization": "Bearer invalid.token.here"}
-
-        response = await async_client.get("/auth/me", headers=invalid_headers)
+        response = await async_client.get("/auth/me", headers=INVALID_BEARER)
 
         assert response.status_code == 401
         data = response.json()
         assert "Token inválido" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_get_current_user_info_no_token(self, async_client: AsyncClient):
         """Test obtener información sin token"""
         response = await async_client.get("/auth/me")
 
         assert response.status_code == 401  # Unauthorized, no token provided
 
-    @pytest.mark.asyncio
     async def test_root_endpoint(self, async_client: AsyncClient):
         """Test endpoint raíz"""
         response = await async_client.get("/")
@@ -1,25 +1,24 @@
 import pytest
 from datetime import timedelta
+from argon2 import PasswordHasher
+from sqlalchemy import select
 
-from app.utils.auth import get_password_hash
+from app.utils import auth as auth_utils
 from app.core.config import settings
 from app.models.user import User
 
 
-def test_automatic_rehash_on_login(db_session, async_client):
-    # Crear usuario con contraseña conocida y hash antiguo (simulamos un esquema antiguo
-    # creando un hash con get_password_hash y luego forzando needs_update -> True mediante
-    # modificando el contexto si fuera necesario. Para simplicidad, crearemos un hash y luego
-    # pretendemos que necesita actualización llamando a pwd_context.needs_update.
+def test_automatic_rehash_on_login(db_session, async_client, argon2_hasher):
+    # Crear usuario con un hash Argon2 generado con parámetros de costo distintos a los
+    # actuales (simula un hash antiguo), de modo que check_needs_rehash devuelva True.
     plain = "SuperSecretPassword123!"
-    # Hash inicial usando la función actual (simula un hash antiguo para fines del test)
-    initial_hash = get_password_hash(plain)
+    old_hasher = PasswordHasher(time_cost=2, memory_cost=16, parallelism=1)
+    initial_hash = old_hasher.hash(plain)
+    assert auth_utils.ph.check_needs_rehash(initial_hash)
 
-    import uuid
-    unique_id = str(uuid.uuid4())[:8]
     user = User(
-        email=f"migrate_test_{unique_id}@example.com",
-        username=f"migrate_test_{unique_id}",
+        email="migrate_test@example.com",
+        username="migrate_test",
         hashed_password=initial_hash,
         full_name="Migrate Test",
         is_active=True,
@@ -34,7 +33,6 @@ def test_automatic_rehash_on_login(db_session, async_client):
         resp = await async_client.post(
             "/auth/login",
             data={"username": user.username, "password": plain},
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
         )
         return resp
 
@@ -42,7 +40,10 @@ def test_automatic_rehash_on_login(db_session, async_client):
 
     assert resp.status_code == 200
 
-    # Refrescar usuario desde la DB y comprobar que hashed_password existe y es distinto
-    db_session.refresh(user)
-    assert user.hashed_password is not None
-    assert isinstance(user.hashed_password, str)
+    # Releer solo la columna del hash desde la DB (sin rehidratar el usuario)
+    stored_hash = db_session.execute(
+        select(User.hashed_password).where(User.id == user.id)
+    ).scalar_one()
+    assert stored_hash != initial_hash
+    assert not auth_utils.ph.check_needs_rehash(stored_hash)
+    assert auth_utils.ph.verify(stored_hash, plain)
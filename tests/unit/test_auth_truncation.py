@@ -2,18 +2,13 @@ import pytest
 
 from app.utils.auth import get_password_hash, verify_password
 
+pytestmark = [pytest.mark.slow, pytest.mark.usefixtures("argon2_hasher")]
 
-def test_truncate_long_ascii_password():
-    # contraseña ASCII muy larga (>72 bytes)
-    pw = 'a' * 200
-    hashed = get_password_hash(pw)
-    assert isinstance(hashed, str)
-    assert verify_password(pw, hashed) is True
-
-
-def test_truncate_long_multibyte_password():
-    # contraseña con caracteres multibyte (emoji) que excede 72 bytes
-    pw = '😊' * 40  # cada emoji ocupa varios bytes en UTF-8
+@pytest.mark.parametrize("pw", [
+    'a' * 200,  # contraseña ASCII muy larga (>72 bytes)
+    '😊' * 40,  # caracteres multibyte (emoji) que exceden 72 bytes en UTF-8
+])
+def test_truncate_long_password(pw):
     hashed = get_password_hash(pw)
     assert isinstance(hashed, str)
     # La verificación debe ser consistente (se aplica el mismo truncado)
@@ -1,11 +1,14 @@
 import pytest
 from datetime import datetime, UTC, timedelta, UTC
+from freezegun import freeze_time
 from app.utils.auth import (
     create_access_token,
     verify_token
 )
 from app.core.config import settings
 
+MALFORMED_TOKENS = ("invalid.token.here", "not.a.valid.jwt")
+
 class TestAuthUtils:
     """Tests para utilidades de autenticación"""
 
@@ -26,48 +29,19 @@ class TestAuthUtils:
         assert isinstance(token, str)
         assert len(token) > 0
 
-    def test_create_access_token(self):
-        """Test para crear token de acceso"""
-        data = {"sub": "testuser", "role": "user"}
-        token = create_access_token(data)
-
-        assert isinstance(token, str)
-        assert len(token) > 0
-
-    def test_create_access_token_with_expiry(self):
-        """Test para crear token con expiración personalizada"""
-        data = {"sub": "testuser"}
-        expires_delta = timedelta(minutes=15)
-        token = create_access_token(data, expires_delta)
-
-        assert isinstance(token, str)
-        assert len(token) > 0
-
-    def test_verify_token_valid(self):
+    def test_verify_token_valid(self, valid_token):
         """Test para verificar token válido"""
-        data = {"sub": "testuser"}
-        token = create_access_token(data)
-        username = verify_token(token)
+        username = verify_token(valid_token)
 
         assert username == "testuser"
 
-    def test_verify_token_invalid(self):
-        """Test para verificar token inválido"""
-        invalid_token = "invalid.token.here"
-        username = verify_token(invalid_token)
-
-        assert username is None
-
-    def test_verify_token_expired(self):
+    def test_verify_token_expired(self, valid_token):
         """Test para verificar token expirado"""
-        data = {"sub": "testuser"}
-        # Crear token con expiración muy corta
-        expired_token = create_access_token(data, timedelta(seconds=-1))
-        username = verify_token(expired_token)
+        # Adelantar el reloj más allá de la expiración del token compartido
+        with freeze_time(datetime.now(UTC) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES + 1)):
+            username = verify_token(valid_token)
 
-        # Nota: Este test podría fallar dependiendo de la implementación
-        # ya que algunos JWT no verifican expiración automáticamente
-        assert username is None or username == "testuser"
+        assert username is None
 
     def test_verify_token_no_sub(self):
         """Test para verificar token sin subject"""
@@ -77,20 +51,13 @@ class TestAuthUtils:
 
         assert username is None
 
-    def test_verify_token_malformed(self):
-        """Test para verificar token malformado"""
-        # Token completamente malformado
-        malformed_token = "not.a.valid.jwt"
+    @pytest.mark.parametrize("malformed_token", MALFORMED_TOKENS)
+    def test_verify_token_malformed(self, malformed_token):
+        """Test para verificar tokens inválidos o malformados"""
         username = verify_token(malformed_token)
 
         assert username is None
 
-    def test_password_hash_mock(self):
-        """Test mock para funciones de hash (bcrypt tiene problemas en este ambiente)"""
-        # Nota: En un ambiente real, aquí irían los tests de bcrypt
-        # Por ahora, verificamos que las funciones existen y son llamadas
-        assert True  # Placeholder para tests de bcrypt
-
     def test_create_token_with_complex_data(self):
         """Test para crear token con datos complejos"""
         complex_data = {
@@ -1,4 +1,3 @@
-import pytest
 from httpx import AsyncClient
 from datetime import date, datetime
 from datetime import UTC
@@ -7,7 +6,6 @@ from sqlalchemy.orm import Session
 class TestBudgetEndpoints:
     """Tests para endpoints de presupuestos"""
 
-    @pytest.mark.asyncio
     async def test_create_budget_success(self, async_client: AsyncClient, auth_headers, db_session: Session, test_category):
         """Test crear presupuesto exitoso"""
         budget_data = {
@@ -43,7 +41,6 @@ class TestBudgetEndpoints:
         assert "id" in data
         assert "user_id" in data
 
-    @pytest.mark.asyncio
     async def test_create_budget_invalid_dates(self, async_client: AsyncClient, auth_headers):
         """Test crear presupuesto con fechas inválidas"""
         budget_data = {
@@ -64,7 +61,6 @@ class TestBudgetEndpoints:
         data = response.json()
         assert "La fecha de inicio debe ser anterior a la fecha de fin" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_get_budgets_list(self, async_client: AsyncClient, auth_headers, test_budget):
         """Test obtener lista de presupuestos"""
         response = await async_client.get("/budgets/", headers=auth_headers)
@@ -85,7 +81,6 @@ class TestBudgetEndpoints:
 
         assert budget_found, "Test budget not found in response"
 
-    @pytest.mark.asyncio
     async def test_get_budget_by_id(self, async_client: AsyncClient, auth_headers, test_budget):
         """Test obtener presupuesto por ID"""
         response = await async_client.get(
@@ -99,7 +94,6 @@ class TestBudgetEndpoints:
         assert data["name"] == test_budget.name
         assert data["total_budgeted"] == str(test_budget.total_budgeted)
 
-    @pytest.mark.asyncio
     async def test_get_budget_not_found(self, async_client: AsyncClient, auth_headers):
         """Test obtener presupuesto inexistente"""
         response = await async_client.get("/budgets/99999", headers=auth_headers)
@@ -108,7 +102,6 @@ class TestBudgetEndpoints:
         data = response.json()
         assert "Presupuesto no encontrado" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_update_budget_success(self, async_client: AsyncClient, auth_headers, test_budget):
         """Test actualizar presupuesto exitoso"""
         update_data = {
@@ -128,7 +121,6 @@ class TestBudgetEndpoints:
         assert data["name"] == "Updated Budget Name"
         assert data["description"] == "Updated description"
 
-    @pytest.mark.asyncio
     async def test_delete_budget_success(self, async_client: AsyncClient, auth_headers, test_budget):
         """Test eliminar presupuesto exitoso"""
         response = await async_client.delete(
@@ -145,7 +137,6 @@ class TestBudgetEndpoints:
         )
         assert get_response.status_code == 404
 
-    @pytest.mark.asyncio
     async def test_create_budget_item_success(self, async_client: AsyncClient, auth_headers, test_budget, test_category):
         """Test crear ítem de presupuesto exitoso"""
         item_data = {
@@ -168,7 +159,6 @@ class TestBudgetEndpoints:
         assert data["notes"] == "Additional budget item"
         assert "id" in data
 
-    @pytest.mark.asyncio
     async def test_create_budget_item_duplicate_category(self, async_client: AsyncClient, auth_headers, test_budget, test_budget_item):
         """Test crear ítem con categoría duplicada"""
         item_data = {
@@ -186,7 +176,6 @@ class TestBudgetEndpoints:
         data = response.json()
         assert "Ya existe un ítem para esta categoría en el presupuesto" in data["detail"]
 
-    @pytest.mark.asyncio
     async def test_update_budget_item_success(self, async_client: AsyncClient, auth_headers, test_budget, test_budget_item):
         """Test actualizar ítem de presupuesto exitoso"""
         update_data = {
@@ -206,7 +195,6 @@ class TestBudgetEndpoints:
         assert data["budgeted_amount"] == "600.00"
         assert data["notes"] == "Updated notes"
 
-    @pytest.mark.asyncio
     async def test_delete_budget_item_success(self, async_client: AsyncClient, auth_headers, test_budget, test_budget_item):
         """Test eliminar ítem de presupuesto exitoso"""
         response = await async_client.delete(
@@ -216,7 +204,6 @@ class TestBudgetEndpoints:
 
         assert response.status_code == 204
 
-    @pytest.mark.asyncio
     async def test_get_budget_comparison(self, async_client: AsyncClient, auth_headers, test_budget, test_budget_item, db_session):
         """Test obtener comparación de presupuesto vs gastos reales"""
         # Crear un gasto en el período del presupuesto
@@ -253,14 +240,12 @@ class TestBudgetEndpoints:
         assert comparison["spent_amount"] == "200.0"
         assert comparison["remaining_amount"] == str(float(test_budget_item.budgeted_amount) - 200.00)
 
-    @pytest.mark.asyncio
     async def test_budget_without_authentication(self, async_client: AsyncClient):
         """Test acceso sin autenticación"""
         response = await async_client.get("/budgets/")
 
         assert response.status_code == 403  # Forbidden
 
-    @pytest.mark.asyncio
     async def test_create_budget_empty_items(self, async_client: AsyncClient, auth_headers):
         """Test crear presupuesto sin ítems"""
         budget_data = {
@@ -0,0 +1,37 @@
+import pytest
+from httpx import AsyncClient
+
+class TestEndpointErrors:
+    """Tests de errores comunes a los endpoints de recursos"""
+
+    @pytest.mark.parametrize("method,url,body,detail", [
+        ("GET", "/debts/99999", None, "Deuda no encontrada"),
+        ("PUT", "/debts/99999", {"current_balance": 1000.00, "notes": "Updated notes"}, "Deuda no encontrada"),
+        ("DELETE", "/debts/99999", None, "Deuda no encontrada"),
+        ("GET", "/expenses/99999", None, "Gasto no encontrado"),
+        ("PUT", "/expenses/99999", {"amount": 100.00, "description": "Updated description"}, "Gasto no encontrado"),
+        ("DELETE", "/expenses/99999", None, "Gasto no encontrado"),
+        ("GET", "/financial-products/99999", None, "Producto financiero no encontrado"),
+        ("PUT", "/financial-products/99999", {"balance": 1000.00, "notes": "Updated notes"}, "Producto financiero no encontrado"),
+        ("DELETE", "/financial-products/99999", None, "Producto financiero no encontrado"),
+        ("GET", "/incomes/99999", None, "Ingreso no encontrado"),
+        ("PUT", "/incomes/99999", {"amount": 1000.00, "description": "Updated description"}, "Ingreso no encontrado"),
+        ("DELETE", "/incomes/99999", None, "Ingreso no encontrado"),
+        ("GET", "/investments/99999", None, "Inversión no encontrada"),
+        ("PUT", "/investments/99999", {"current_value": 1500.00, "notes": "Updated notes"}, "Inversión no encontrada"),
+        ("DELETE", "/investments/99999", None, "Inversión no encontrada"),
+    ])
+    async def test_resource_not_found(self, async_client: AsyncClient, auth_headers, method, url, body, detail):
+        """Test operar sobre un recurso inexistente"""
+        response = await async_client.request(method, url, json=body, headers=auth_headers)
+
+        assert response.status_code == 404
+        data = response.json()
+        assert detail in data["detail"]
+
+    @pytest.mark.parametrize("url", ["/debts/", "/expenses/", "/financial-products/", "/incomes/", "/investments/"])
+    async def test_resource_without_authentication(self, async_client: AsyncClient, url):
+        """Test acceso sin autenticación"""
+        response = await async_client.get(url)
+
+        assert response.status_code == 403  # Forbidden
